@@ -9,6 +9,12 @@ import win32print
 import random
 from configuracion.windowsConfiWtiqueta import mostrar_ventana_config_etiqueta
 from configuracion.material import cargar_materiales
+from configuracion.grafica_peso import GraficaPeso
+from configuracion.totales_turno import TotalesTurno, mostrar_ventana_totales
+from configuracion.vista_previa import VistaPreviaEtiqueta
+from configuracion.sincronizacion import (iniciar_sincronizacion, avisos_pendientes,
+                                          tomar_version_compartida, conservar_version_local)
+import threading
 import textwrap
 # Configuraciones constantes
 APP_DATA = os.getenv("APPDATA")
@@ -18,12 +24,42 @@ FONT_LCD = ("DS-Digital", 100, "bold")
 FONT_LATO = ("Lato", 14)
 FONT_LATO_LARGE = ("Lato", 30, "bold")
 UPDATE_INTERVAL_MS = 100
+MUESTREO_PESO_MS = 50  # 20 Hz
+REVISION_AVISOS_MS = 5000
+
+# Totales por turno de las etiquetas impresas
+totales_turno = TotalesTurno(CONTROLADOR_FOLDER, TIMEZONE)
 
 # --- Funciones de peso aleatorio ---
 def generar_peso_aleatorio() -> str:
     """Genera un peso aleatorio con formato 000.000"""
     return f"{random.randint(100, 999):03d}.{random.randint(0, 999):03d}"
 
+def iniciar_muestreo_peso(app: tk.Tk, grafica: GraficaPeso) -> None:
+    """Lee el peso periódicamente y lo agrega a la gráfica de tendencia"""
+    def muestrear():
+        grafica.agregar_muestra(float(generar_peso_aleatorio()))
+        app.after(MUESTREO_PESO_MS, muestrear)
+    muestrear()
+
+# --- Sincronización con la carpeta compartida ---
+def revisar_avisos_sincronizacion(app: tk.Tk) -> None:
+    """Avisa al operador de documentos en conflicto con la versión compartida"""
+    nombres = {"materiales": "el catálogo de materiales", "config_etiqueta": "el tamaño de etiqueta"}
+    for nombre in avisos_pendientes():
+        descartar = messagebox.askyesno(
+            "Conflicto de sincronización",
+            f"Otra estación publicó una versión más reciente de {nombres.get(nombre, nombre)} "
+            "y los cambios de esta estación no se publicaron.\n\n"
+            "¿Desea descartar los cambios locales y usar la versión compartida?\n\n"
+            "Sí: se usa la versión compartida.\n"
+            "No: se conservan los cambios locales y se publican reemplazando la versión compartida.",
+            parent=app
+        )
+        resolver = tomar_version_compartida if descartar else conservar_version_local
+        threading.Thread(target=resolver, args=(nombre,), daemon=True).start()
+    app.after(REVISION_AVISOS_MS, revisar_avisos_sincronizacion, app)
+
 # --- Funciones de Configuración de Etiqueta ---
 def obtener_config_etiqueta() -> tuple[int, int]:
     
@@ -61,7 +97,7 @@ import textwrap
 
 def generar_zpl(descripcion: str, operador: str, origen: str, 
                 destino: str, peso: str, fecha: str, hora: str,
-                ancho: int, alto: int) -> str:
+                ancho: int, alto: int, depurar: bool = True) -> str:
     """
     Genera ZPL para impresión con parámetros calculados automáticamente.
     
@@ -79,6 +115,7 @@ def generar_zpl(descripcion: str, operador: str, origen: str,
     en ese caso se intercambian las dimensiones para el cálculo, se añade el comando ^FWR y se
     invierte la forma de posicionar los campos (se intercambian las coordenadas en ^FO).
     Además, en modo rotado se muestra en consola cómo quedaría el código ZPL SIN rotación (simulado).
+    Con depurar=False no se muestran en consola los parámetros calculados (vista previa).
     """
     # Determinar si se debe rotar
     rotate = False
@@ -101,10 +138,11 @@ def generar_zpl(descripcion: str, operador: str, origen: str,
     y_offset = int(effective_height * 0.07)
     x_offset = int(effective_width * 0.03)
     
-    print(f"Configuración de etiqueta: ancho={ancho} dots, alto={alto} dots")
-    if rotate:
-        print(f"Rotación activada. Usando dimensiones efectivas: ancho={effective_width} dots, alto={effective_height} dots")
-    print(f"Parámetros calculados: line_spacing={line_spacing}, font_size={font_size}, x_offset={x_offset}, y_offset={y_offset}")
+    if depurar:
+        print(f"Configuración de etiqueta: ancho={ancho} dots, alto={alto} dots")
+        if rotate:
+            print(f"Rotación activada. Usando dimensiones efectivas: ancho={effective_width} dots, alto={effective_height} dots")
+        print(f"Parámetros calculados: line_spacing={line_spacing}, font_size={font_size}, x_offset={x_offset}, y_offset={y_offset}")
     
     # Lista de campos en orden lógico (sin invertir el orden de la lista)
     fields = [
@@ -216,7 +254,7 @@ def generar_zpl(descripcion: str, operador: str, origen: str,
 
 
 def imprimir_etiqueta(descripcion: str, operador: str, origen: str, 
-                      destino: str, peso: str, fecha: str, hora: str) -> None:
+                      destino: str, peso: str, fecha: str, hora: str) -> bool:
     ancho, alto = obtener_config_etiqueta()
     zpl_comando = generar_zpl(descripcion, operador, origen, destino, peso, fecha, hora, ancho, alto)
     # Imprimir en consola el código ZPL que se va a enviar
@@ -231,15 +269,17 @@ def imprimir_etiqueta(descripcion: str, operador: str, origen: str,
         win32print.EndPagePrinter(hprinter)
         win32print.EndDocPrinter(hprinter)
         win32print.ClosePrinter(hprinter)
+        return True
     except Exception as e:
         messagebox.showerror("Error de impresión", f"No se pudo imprimir: {str(e)}")
+        return False
 
 # --- Interfaz Gráfica ---
 def crear_interfaz_grafica(opciones_descripcion: list) -> tuple[tk.Tk, tk.Label]:
     app = tk.Tk()
     app.title("Sistema de Impresión de Etiquetas")
     app.configure(background='white')
-    app.geometry("800x500")
+    app.geometry("1100x720")
 
     # Frame principal
     main_frame = tk.Frame(app, bg="white")
@@ -277,6 +317,23 @@ def crear_interfaz_grafica(opciones_descripcion: list) -> tuple[tk.Tk, tk.Label]
     
     campos[0][1].set(opciones_descripcion[0])
 
+    # Vista previa de la etiqueta a partir del ZPL que se enviaría
+    def generar_vista_previa():
+        ancho, alto = obtener_config_etiqueta()
+        ahora = datetime.now(TIMEZONE)
+        zpl = generar_zpl(campos[0][1].get(), campos[1][1].get(), campos[2][1].get(),
+                          campos[3][1].get(), "000.000", ahora.strftime("%Y-%m-%d"),
+                          ahora.strftime("%H:%M:%S"), ancho, alto, depurar=False)
+        return zpl, ancho, alto
+
+    vista_previa = VistaPreviaEtiqueta(form_frame, generar_vista_previa)
+    vista_previa.canvas.grid(row=0, column=2, rowspan=len(campos), padx=15, sticky="n")
+    for _, widget in campos:
+        widget.bind("<KeyRelease>", vista_previa.programar)
+    campos[0][1].bind("<<ComboboxSelected>>", vista_previa.programar)
+    vista_previa.programar()
+    vista_previa.vigilar_tamano(obtener_config_etiqueta)
+
     # Botones
     button_frame = tk.Frame(main_frame, bg="white")
     button_frame.pack(pady=20)
@@ -292,18 +349,29 @@ def crear_interfaz_grafica(opciones_descripcion: list) -> tuple[tk.Tk, tk.Label]
     btn_imprimir.pack(side="left", padx=10)
 
     btn_limpiar = tk.Button(button_frame, text="Limpiar Campos", font=FONT_LATO,
-                          command=lambda: limpiar_campos(campos),
+                          command=lambda: (limpiar_campos(campos), vista_previa.programar()),
                           bg="#f44336", fg="white", width=15)
     btn_limpiar.pack(side="left", padx=10)
 
+    # Gráfica de tendencia del peso
+    grafica = GraficaPeso(main_frame)
+    grafica.pack(fill="x")
+    iniciar_muestreo_peso(app, grafica)
+
     # Menú de configuración
     menu_bar = Menu(app)
     menu_config = Menu(menu_bar, tearoff=0)
     menu_config.add_command(label="Tamaño de Etiqueta", 
-                          command=lambda: mostrar_ventana_config_etiqueta(app))
+                          command=lambda: mostrar_ventana_config_etiqueta(app, vista_previa.programar))
     menu_bar.add_cascade(label="Configuraciones", menu=menu_config)
+    menu_reportes = Menu(menu_bar, tearoff=0)
+    menu_reportes.add_command(label="Totales del Turno",
+                            command=lambda: mostrar_ventana_totales(app, totales_turno))
+    menu_bar.add_cascade(label="Reportes", menu=menu_reportes)
     app.config(menu=menu_bar)
 
+    revisar_avisos_sincronizacion(app)
+
     return app, lbl_hora
 
 def limpiar_campos(campos):
@@ -317,7 +385,7 @@ def procesar_impresion(descripcion, operador, origen, destino, parent):
     peso = generar_peso_aleatorio()
     ahora = datetime.now(TIMEZONE)
     
-    imprimir_etiqueta(
+    impreso = imprimir_etiqueta(
         descripcion=descripcion,
         operador=operador,
         origen=origen,
@@ -326,9 +394,12 @@ def procesar_impresion(descripcion, operador, origen, destino, parent):
         fecha=ahora.strftime("%Y-%m-%d"),
         hora=ahora.strftime("%H:%M:%S")
     )
+    if impreso:
+        totales_turno.registrar(descripcion, operador, destino, float(peso), ahora)
     
 
 if __name__ == "__main__":
+    iniciar_sincronizacion()
     opciones_materiales = cargar_materiales()
     app, _ = crear_interfaz_grafica(opciones_materiales)
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,176 @@
+import tkinter as tk
+from tkinter import ttk
+from array import array
+import time
+
+# Ventanas de tiempo disponibles para la gráfica (etiqueta -> segundos)
+VENTANAS_TIEMPO = {
+    "1 min": 60,
+    "5 min": 300,
+    "15 min": 900,
+    "30 min": 1800,
+    "1 h": 3600,
+}
+FRECUENCIA_MAX_HZ = 20
+REDIBUJO_MS = 200
+
+
+class BufferPeso:
+    """
+    Buffer circular de tamaño fijo con las muestras de peso (tiempo, kg)
+    y su decimación min/max a una pareja de valores por columna de píxel.
+
+    Cada muestra nueva actualiza únicamente la columna que le corresponde,
+    por lo que agregar es O(1) y la memoria no crece con el tiempo.
+    """
+
+    def __init__(self, columnas: int, ventana_s: float,
+                 ventana_max_s: float = 3600, frecuencia_hz: float = FRECUENCIA_MAX_HZ):
+        self.capacidad = int(ventana_max_s * frecuencia_hz)
+        self.tiempos = array("d", bytes(8 * self.capacidad))
+        self.pesos = array("d", bytes(8 * self.capacidad))
+        self.inicio = 0
+        self.cantidad = 0
+
+        self.columnas = columnas
+        self.col_min = array("d", [0.0]) * columnas
+        self.col_max = array("d", [0.0]) * columnas
+        # Índice de intervalo (bucket) al que pertenece cada ranura; -1 = vacía
+        self.col_id = array("q", [-1]) * columnas
+        self.cambiar_ventana(ventana_s)
+
+    def cambiar_ventana(self, ventana_s: float) -> None:
+        """Cambia la ventana de tiempo y reconstruye las columnas desde el buffer."""
+        self.ventana_s = ventana_s
+        self.duracion_col = ventana_s / self.columnas
+        for i in range(self.columnas):
+            self.col_id[i] = -1
+        if not self.cantidad:
+            return
+        limite = self.tiempos[(self.inicio + self.cantidad - 1) % self.capacidad] - ventana_s
+        for i in range(self.cantidad):
+            idx = (self.inicio + i) % self.capacidad
+            if self.tiempos[idx] >= limite:
+                self._acumular(self.tiempos[idx], self.pesos[idx])
+
+    def agregar(self, t: float, peso: float) -> None:
+        """Agrega una muestra; si el buffer está lleno se sobrescribe la más antigua."""
+        if self.cantidad < self.capacidad:
+            idx = (self.inicio + self.cantidad) % self.capacidad
+            self.cantidad += 1
+        else:
+            idx = self.inicio
+            self.inicio = (self.inicio + 1) % self.capacidad
+        self.tiempos[idx] = t
+        self.pesos[idx] = peso
+        self._acumular(t, peso)
+
+    def _acumular(self, t: float, peso: float) -> None:
+        bucket = int(t // self.duracion_col)
+        ranura = bucket % self.columnas
+        if self.col_id[ranura] != bucket:
+            self.col_id[ranura] = bucket
+            self.col_min[ranura] = peso
+            self.col_max[ranura] = peso
+        elif peso < self.col_min[ranura]:
+            self.col_min[ranura] = peso
+        elif peso > self.col_max[ranura]:
+            self.col_max[ranura] = peso
+
+    def columnas_visibles(self, ahora: float) -> list[tuple[int, float, float]]:
+        """Devuelve (columna_x, mínimo, máximo) para las columnas con datos en la ventana."""
+        ultimo = int(ahora // self.duracion_col)
+        primero = ultimo - self.columnas + 1
+        resultado = []
+        for x in range(self.columnas):
+            bucket = primero + x
+            ranura = bucket % self.columnas
+            if self.col_id[ranura] == bucket:
+                resultado.append((x, self.col_min[ranura], self.col_max[ranura]))
+        return resultado
+
+
+class GraficaPeso:
+    """
+    Panel con la tendencia reciente del peso dibujada en un Canvas.
+    Los elementos del Canvas se crean una sola vez y se actualizan en su lugar.
+    """
+
+    def __init__(self, parent: tk.Widget, ancho: int = 740, alto: int = 150,
+                 ventana_inicial: str = "5 min"):
+        self.ancho = ancho
+        self.alto = alto
+        self.margen_izq = 60
+        self.margen_vert = 10
+        self.buffer = BufferPeso(ancho - self.margen_izq, VENTANAS_TIEMPO[ventana_inicial],
+                                 ventana_max_s=max(VENTANAS_TIEMPO.values()))
+
+        self.frame = tk.Frame(parent, bg="white")
+
+        barra = tk.Frame(self.frame, bg="white")
+        barra.pack(fill="x")
+        tk.Label(barra, text="Tendencia de peso", font=("Lato", 12), bg="white").pack(side="left")
+        self.combo_ventana = ttk.Combobox(barra, values=list(VENTANAS_TIEMPO), state="readonly",
+                                          font=("Lato", 10), width=8)
+        self.combo_ventana.set(ventana_inicial)
+        self.combo_ventana.pack(side="right")
+        self.combo_ventana.bind("<<ComboboxSelected>>", self._cambiar_ventana)
+        tk.Label(barra, text="Ventana:", font=("Lato", 10), bg="white").pack(side="right", padx=5)
+
+        self.canvas = tk.Canvas(self.frame, width=ancho, height=alto, bg="white",
+                                highlightthickness=1, highlightbackground="#cccccc")
+        self.canvas.pack()
+        self.canvas.create_line(self.margen_izq, 0, self.margen_izq, alto, fill="#cccccc")
+        self.txt_max = self.canvas.create_text(self.margen_izq - 5, self.margen_vert, anchor="e",
+                                               font=("Lato", 9), text="")
+        self.txt_min = self.canvas.create_text(self.margen_izq - 5, alto - self.margen_vert, anchor="e",
+                                               font=("Lato", 9), text="")
+        self.linea = self.canvas.create_line(0, 0, 0, 0, fill="#2196F3", state="hidden")
+
+        self.canvas.after(REDIBUJO_MS, self._redibujar)
+
+    def pack(self, **kwargs) -> None:
+        self.frame.pack(**kwargs)
+
+    def agregar_muestra(self, peso: float, t: float | None = None) -> None:
+        self.buffer.agregar(time.monotonic() if t is None else t, peso)
+
+    def _cambiar_ventana(self, *args) -> None:
+        self.buffer.cambiar_ventana(VENTANAS_TIEMPO[self.combo_ventana.get()])
+        self._dibujar()
+
+    def _redibujar(self) -> None:
+        self._dibujar()
+        self.canvas.after(REDIBUJO_MS, self._redibujar)
+
+    def _dibujar(self) -> None:
+        columnas = self.buffer.columnas_visibles(time.monotonic())
+        if not columnas:
+            self.canvas.itemconfigure(self.linea, state="hidden")
+            self.canvas.itemconfigure(self.txt_max, text="")
+            self.canvas.itemconfigure(self.txt_min, text="")
+            return
+
+        minimo = min(c[1] for c in columnas)
+        maximo = max(c[2] for c in columnas)
+        rango = maximo - minimo
+        if rango <= 0:
+            rango = 1.0
+            minimo -= 0.5
+            maximo += 0.5
+        escala = (self.alto - 2 * self.margen_vert) / rango
+        base = self.alto - self.margen_vert
+
+        # Para cada columna se trazan sus puntos mínimo y máximo (envolvente min/max)
+        puntos = []
+        for x, c_min, c_max in columnas:
+            px = self.margen_izq + x
+            puntos.append(px)
+            puntos.append(base - (c_min - minimo) * escala)
+            puntos.append(px)
+            puntos.append(base - (c_max - minimo) * escala)
+
+        self.canvas.coords(self.linea, *puntos)
+        self.canvas.itemconfigure(self.linea, state="normal")
+        self.canvas.itemconfigure(self.txt_max, text=f"{maximo:.3f} kg")
+        self.canvas.itemconfigure(self.txt_min, text=f"{minimo:.3f} kg")
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import messagebox
 import json
 import os
+from configuracion.sincronizacion import publicar_en_segundo_plano
 
 # Determinar la ruta de APPDATA y establecer la ruta para materiales.json
 appdata_path = os.environ.get('APPDATA')
@@ -66,6 +67,7 @@ def guardar_material(nuevo_material, ventana):
         data["materiales"].append(nuevo_material)
         with open(ruta_materiales, "w", encoding="utf-8") as archivo:
             json.dump(data, archivo, indent=4)
+        publicar_en_segundo_plano("materiales")
             
         messagebox.showinfo("Éxito", "Material agregado correctamente.", parent=ventana)
         return True
@@ -79,6 +81,7 @@ def actualizar_materiales(nuevos_materiales):
         data = {"materiales": nuevos_materiales}
         with open(ruta_materiales, "w", encoding="utf-8") as archivo:
             json.dump(data, archivo, indent=4)
+        publicar_en_segundo_plano("materiales")
     except Exception as e:
         messagebox.showerror("Error", f"No se pudo actualizar el archivo materiales.json: {str(e)}")
 
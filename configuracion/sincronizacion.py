@@ -0,0 +1,393 @@
+"""
+Sincronización opcional del catálogo de materiales y la configuración de etiqueta
+entre estaciones a través de una carpeta compartida.
+
+La carpeta compartida se indica en %APPDATA%/ZZZ/sincronizacion.json:
+    {"ruta_compartida": "\\\\servidor\\basculas", "intervalo_s": 30}
+Si el archivo no existe la sincronización queda desactivada.
+
+Estructura de la carpeta compartida:
+    version.json                      manifiesto: versión global y por documento (sha256)
+    documentos/<nombre>-<versión>.json  cada versión publicada de un documento
+    .bloqueo                          archivo de bloqueo para escritores
+
+Las estaciones sólo leen version.json en cada sondeo y descargan los documentos
+cuyo checksum cambió. Los archivos locales siguen siendo la fuente de lectura de
+la aplicación, así que una carpeta lenta o inaccesible nunca retrasa la impresión.
+
+Una estación sólo publica si su copia local partió de la versión publicada
+actualmente; si otra estación publicó antes, la publicación se rechaza y se
+avisa al operador (ver avisos_pendientes), que elige entre tomar la versión
+compartida o conservar la local y publicarla encima. Las publicaciones que
+fallan por la carpeta compartida quedan pendientes y se reintentan en cada sondeo.
+"""
+import hashlib
+import json
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+
+APPDATA = os.environ.get("APPDATA", "")
+RUTA_CONFIG = os.path.join(APPDATA, "ZZZ", "sincronizacion.json")
+RUTA_ESTADO = os.path.join(APPDATA, "ZZZ", "sincronizacion_estado.json")
+# Documentos sincronizados y su archivo local
+DOCUMENTOS = {
+    "materiales": os.path.join(APPDATA, "EpsonDriver", "materiales.json"),
+    "config_etiqueta": os.path.join(APPDATA, "ZZZ", "config_etiqueta.json"),
+}
+INTERVALO_SONDEO_S = 30
+ESPERA_BLOQUEO_S = 10
+# Un bloqueo creado hace más de esto (según la hora guardada en él) se considera abandonado
+BLOQUEO_EXPIRA_S = 60
+
+# Serializa el acceso a la carpeta compartida y al estado local; puede retenerse
+# durante E/S lenta, así que la interfaz nunca debe esperarlo.
+_candado = threading.Lock()
+# Documentos en conflicto pendientes de avisar al operador (cola propia, sin _candado)
+_avisos = queue.Queue()
+
+
+def cargar_config() -> dict | None:
+    """Devuelve la configuración de sincronización o None si está desactivada."""
+    if not os.path.exists(RUTA_CONFIG):
+        return None
+    try:
+        with open(RUTA_CONFIG, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        return config if config.get("ruta_compartida") else None
+    except Exception as e:
+        print(f"Error al leer configuración de sincronización: {e}")
+        return None
+
+
+def checksum(datos) -> str:
+    contenido = json.dumps(datos, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(contenido).hexdigest()
+
+
+def _leer_json(ruta: str, defecto=None):
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return defecto
+
+
+def _escribir_json(ruta: str, datos) -> None:
+    """Escribe el archivo de forma atómica (temporal + reemplazo)."""
+    carpeta = os.path.dirname(ruta)
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=4, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def _leer_estado() -> dict:
+    estado = _leer_json(RUTA_ESTADO, {})
+    estado.setdefault("version", 0)
+    estado.setdefault("documentos", {})
+    estado.setdefault("conflictos", {})
+    # Publicaciones por reintentar: {nombre: versión compartida sobre la que se publica o None}
+    estado.setdefault("pendientes", {})
+    return estado
+
+
+def _avisar_conflicto(nombre: str) -> None:
+    _avisos.put(nombre)
+
+
+def avisos_pendientes() -> list[str]:
+    """
+    Devuelve (y olvida) los documentos en conflicto que falta avisar al operador.
+    No espera a la carpeta compartida: se puede llamar desde el hilo de la interfaz.
+    """
+    pendientes = []
+    while True:
+        try:
+            nombre = _avisos.get_nowait()
+        except queue.Empty:
+            return pendientes
+        if nombre not in pendientes:
+            pendientes.append(nombre)
+
+
+# --- Bloqueo de escritores ---
+def _crear_sin_reemplazar(origen: str, destino: str) -> None:
+    """Mueve `origen` a `destino` de forma atómica; FileExistsError si `destino` ya existe."""
+    if os.name == "nt":
+        # En Windows os.rename no reemplaza un destino existente
+        os.rename(origen, destino)
+    else:
+        os.link(origen, destino)
+        os.remove(origen)
+
+
+def _leer_bloqueo(ruta: str) -> dict | None:
+    """Contenido del bloqueo, None si no existe o {} si es ilegible."""
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        return {}
+
+
+def _retirar_bloqueo(ruta: str, token: str | None) -> bool:
+    """
+    Retira el bloqueo sólo si contiene `token`. Primero se renombra a un nombre
+    único (atómico: sólo una estación lo logra) y, si resulta ser el bloqueo de
+    otra estación, se restaura.
+    """
+    movido = f"{ruta}.{uuid.uuid4().hex}.retirado"
+    try:
+        os.rename(ruta, movido)
+    except FileNotFoundError:
+        return False
+    bloqueo = _leer_bloqueo(movido) or {}
+    if bloqueo.get("token") == token:
+        os.remove(movido)
+        return True
+    try:
+        _crear_sin_reemplazar(movido, ruta)
+    except FileExistsError:
+        os.remove(movido)
+    return False
+
+
+def _adquirir_bloqueo(ruta_compartida: str) -> tuple[str, str] | None:
+    """Crea el bloqueo con un token único; devuelve (ruta, token) o None si no se obtuvo."""
+    ruta = os.path.join(ruta_compartida, ".bloqueo")
+    token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+    limite = time.monotonic() + ESPERA_BLOQUEO_S
+    while True:
+        # El bloqueo se escribe completo en un temporal y luego se coloca sin reemplazar,
+        # así nunca hay un bloqueo vacío o a medio escribir.
+        temporal = f"{ruta}.{uuid.uuid4().hex}.nuevo"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump({"token": token, "creado": time.time()}, f)
+        try:
+            _crear_sin_reemplazar(temporal, ruta)
+            return ruta, token
+        except FileExistsError:
+            os.remove(temporal)
+
+        bloqueo = _leer_bloqueo(ruta)
+        if bloqueo is None:
+            continue
+        creado = bloqueo.get("creado")
+        if creado is None or time.time() - creado > BLOQUEO_EXPIRA_S:
+            print(f"Se retira un bloqueo abandonado de la carpeta compartida: {bloqueo.get('token')}")
+            _retirar_bloqueo(ruta, bloqueo.get("token"))
+            continue
+        if time.monotonic() > limite:
+            return None
+        time.sleep(0.2)
+
+
+def _bloqueo_vigente(ruta: str, token: str) -> bool:
+    bloqueo = _leer_bloqueo(ruta)
+    return bool(bloqueo) and bloqueo.get("token") == token
+
+
+# --- Publicación y sincronización ---
+def _marcar_pendiente(estado: dict, nombre: str, sobre_version: int | None) -> None:
+    """Registra una publicación que no se pudo completar, para reintentarla en el sondeo."""
+    estado["pendientes"][nombre] = sobre_version
+    _escribir_json(RUTA_ESTADO, estado)
+
+
+def publicar(nombre: str, sobre_version: int | None = None) -> bool:
+    """
+    Publica en la carpeta compartida la versión local del documento `nombre`
+    como una nueva versión. No hace nada si el contenido ya es el publicado.
+
+    Si la versión compartida cambió desde la última sincronización de esta
+    estación, no se publica (se perderían los cambios de otra estación) y se
+    registra un aviso para el operador. Con `sobre_version` el operador decidió
+    conservar su copia local: se publica encima si la versión compartida sigue
+    siendo esa.
+
+    Si la carpeta no está disponible o no se obtiene el bloqueo, la publicación
+    queda pendiente en el estado local y se reintenta en cada sondeo.
+    """
+    config = cargar_config()
+    if config is None:
+        return False
+    ruta_compartida = config["ruta_compartida"]
+    with _candado:
+        estado = _leer_estado()
+        try:
+            datos = _leer_json(DOCUMENTOS[nombre])
+            if datos is None:
+                return False
+            suma = checksum(datos)
+            bloqueo = _adquirir_bloqueo(ruta_compartida)
+            if bloqueo is None:
+                print(f"No se pudo bloquear la carpeta compartida; {nombre} queda pendiente de publicar")
+                _marcar_pendiente(estado, nombre, sobre_version)
+                return False
+            ruta_bloqueo, token = bloqueo
+            try:
+                ruta_manifiesto = os.path.join(ruta_compartida, "version.json")
+                manifiesto = _leer_json(ruta_manifiesto, {"version": 0, "documentos": {}})
+                info = manifiesto["documentos"].get(nombre, {})
+                publicado = info.get("sha256")
+                if publicado == suma:
+                    # Ya publicado (p. ej. por otra estación): sólo se registra como base local
+                    pass
+                elif (publicado is not None and publicado != estado["documentos"].get(nombre)
+                      and (sobre_version is None or info["version"] != sobre_version)):
+                    print(f"{nombre}: otra estación publicó una versión más reciente; no se publica")
+                    estado["conflictos"][nombre] = info["version"]
+                    estado["pendientes"].pop(nombre, None)
+                    _escribir_json(RUTA_ESTADO, estado)
+                    _avisar_conflicto(nombre)
+                    return False
+                else:
+                    version = manifiesto["version"] + 1
+                    archivo = f"{nombre}-{version:06d}.json"
+                    _escribir_json(os.path.join(ruta_compartida, "documentos", archivo), datos)
+                    if not _bloqueo_vigente(ruta_bloqueo, token):
+                        print(f"Se perdió el bloqueo de la carpeta compartida; {nombre} queda pendiente")
+                        _marcar_pendiente(estado, nombre, sobre_version)
+                        return False
+                    manifiesto["version"] = version
+                    manifiesto["documentos"][nombre] = {"version": version, "sha256": suma, "archivo": archivo}
+                    _escribir_json(ruta_manifiesto, manifiesto)
+            finally:
+                if not _retirar_bloqueo(ruta_bloqueo, token):
+                    print("El bloqueo de la carpeta compartida ya no pertenecía a esta estación")
+
+            estado["documentos"][nombre] = suma
+            estado["conflictos"].pop(nombre, None)
+            estado["pendientes"].pop(nombre, None)
+            _escribir_json(RUTA_ESTADO, estado)
+            return True
+        except Exception as e:
+            print(f"Error al publicar {nombre} en la carpeta compartida; queda pendiente: {e}")
+            try:
+                _marcar_pendiente(estado, nombre, sobre_version)
+            except Exception as error:
+                print(f"No se pudo registrar la publicación pendiente de {nombre}: {error}")
+            return False
+
+
+def publicar_en_segundo_plano(nombre: str) -> None:
+    """Publica sin bloquear la interfaz; si la sincronización está desactivada no hace nada."""
+    if cargar_config() is not None:
+        threading.Thread(target=publicar, args=(nombre,), daemon=True).start()
+
+
+def reintentar_pendientes() -> list[str]:
+    """Reintenta las publicaciones pendientes. Devuelve las que se completaron."""
+    with _candado:
+        pendientes = dict(_leer_estado()["pendientes"])
+    return [nombre for nombre, sobre_version in pendientes.items()
+            if nombre in DOCUMENTOS and publicar(nombre, sobre_version)]
+
+
+def conservar_version_local(nombre: str) -> bool:
+    """
+    Resuelve un conflicto conservando la copia local: se publica encima de la
+    versión compartida que se avisó al operador. Si mientras tanto otra estación
+    publicó otra versión, se vuelve a avisar.
+    """
+    with _candado:
+        sobre_version = _leer_estado()["conflictos"].get(nombre)
+    return publicar(nombre, sobre_version)
+
+
+def _descargar(ruta_compartida: str, nombre: str, info: dict, estado: dict) -> bool:
+    datos = _leer_json(os.path.join(ruta_compartida, "documentos", info["archivo"]))
+    if datos is None or checksum(datos) != info["sha256"]:
+        print(f"Checksum inválido en {info['archivo']}; se reintentará en el próximo sondeo")
+        return False
+    _escribir_json(DOCUMENTOS[nombre], datos)
+    estado["documentos"][nombre] = info["sha256"]
+    estado["conflictos"].pop(nombre, None)
+    return True
+
+
+def sincronizar() -> list[str]:
+    """
+    Compara la versión de la carpeta compartida con la aplicada localmente y
+    descarga sólo los documentos cuyo checksum cambió. Devuelve los actualizados.
+
+    Un documento con cambios locales sin publicar no se sobrescribe: queda en
+    conflicto y se avisa al operador una vez por versión compartida.
+    """
+    config = cargar_config()
+    if config is None:
+        return []
+    ruta_compartida = config["ruta_compartida"]
+    actualizados = []
+    with _candado:
+        manifiesto = _leer_json(os.path.join(ruta_compartida, "version.json"))
+        estado = _leer_estado()
+        if manifiesto is None or manifiesto["version"] == estado["version"]:
+            return []
+        for nombre, info in manifiesto["documentos"].items():
+            base = estado["documentos"].get(nombre)
+            if nombre not in DOCUMENTOS or base == info["sha256"]:
+                continue
+            local = _leer_json(DOCUMENTOS[nombre])
+            if local is not None and checksum(local) == info["sha256"]:
+                estado["documentos"][nombre] = info["sha256"]
+                continue
+            if base is not None and local is not None and checksum(local) != base:
+                if estado["conflictos"].get(nombre) != info["version"]:
+                    estado["conflictos"][nombre] = info["version"]
+                    _avisar_conflicto(nombre)
+                continue
+            if not _descargar(ruta_compartida, nombre, info, estado):
+                _escribir_json(RUTA_ESTADO, estado)
+                return actualizados
+            actualizados.append(nombre)
+        estado["version"] = manifiesto["version"]
+        _escribir_json(RUTA_ESTADO, estado)
+    return actualizados
+
+
+def tomar_version_compartida(nombre: str) -> bool:
+    """Descarta los cambios locales de `nombre` y aplica la versión publicada."""
+    config = cargar_config()
+    if config is None:
+        return False
+    ruta_compartida = config["ruta_compartida"]
+    with _candado:
+        manifiesto = _leer_json(os.path.join(ruta_compartida, "version.json"))
+        if manifiesto is None or nombre not in manifiesto["documentos"]:
+            return False
+        estado = _leer_estado()
+        ok = _descargar(ruta_compartida, nombre, manifiesto["documentos"][nombre], estado)
+        _escribir_json(RUTA_ESTADO, estado)
+        return ok
+
+
+def iniciar_sincronizacion() -> None:
+    """Inicia el sondeo periódico en un hilo aparte si la sincronización está configurada."""
+    config = cargar_config()
+    if config is None:
+        return
+    intervalo = config.get("intervalo_s", INTERVALO_SONDEO_S)
+
+    def sondear():
+        while True:
+            try:
+                publicados = reintentar_pendientes()
+                if publicados:
+                    print(f"Publicados en la carpeta compartida: {', '.join(publicados)}")
+                actualizados = sincronizar()
+                if actualizados:
+                    print(f"Sincronizados desde la carpeta compartida: {', '.join(actualizados)}")
+            except Exception as e:
+                print(f"Carpeta compartida no disponible: {e}")
+            time.sleep(intervalo)
+
+    threading.Thread(target=sondear, daemon=True).start()
@@ -0,0 +1,235 @@
+import tkinter as tk
+from tkinter import ttk
+from datetime import datetime, timedelta
+import json
+import os
+
+# Hora de inicio de cada turno (hora local), ordenadas
+TURNOS_INICIO = (6, 14, 22)
+# Dimensiones por las que se acumulan los totales
+DIMENSIONES = ("material", "operador", "destino")
+# Cada cuántos registros se escribe un snapshot completo y se vacía el log
+SNAPSHOT_CADA = 100
+# Cantidad de turnos que se conservan (3 días)
+TURNOS_CONSERVADOS = 9
+
+
+def inicio_turno(ahora: datetime) -> datetime:
+    """Devuelve el inicio del turno al que pertenece `ahora` (fecha con zona horaria)."""
+    inicio = None
+    for hora in TURNOS_INICIO:
+        if ahora.hour >= hora:
+            inicio = hora
+    if inicio is None:
+        # Antes del primer turno: pertenece al último turno del día anterior
+        anterior = ahora - timedelta(days=1)
+        return anterior.replace(hour=TURNOS_INICIO[-1], minute=0, second=0, microsecond=0)
+    return ahora.replace(hour=inicio, minute=0, second=0, microsecond=0)
+
+
+def nuevo_acumulado() -> dict:
+    return {"cantidad": 0, "total": 0.0, "minimo": None, "maximo": None}
+
+
+def acumular(acumulado: dict, peso: float) -> None:
+    """Actualiza en O(1) un acumulado con un nuevo peso."""
+    acumulado["cantidad"] += 1
+    acumulado["total"] += peso
+    if acumulado["minimo"] is None or peso < acumulado["minimo"]:
+        acumulado["minimo"] = peso
+    if acumulado["maximo"] is None or peso > acumulado["maximo"]:
+        acumulado["maximo"] = peso
+
+
+def promedio(acumulado: dict) -> float:
+    return acumulado["total"] / acumulado["cantidad"] if acumulado["cantidad"] else 0.0
+
+
+class TotalesTurno:
+    """
+    Totales por turno (cantidad, total kg, mínimo, máximo y promedio) por material,
+    operador y destino.
+
+    Cada impresión se agrega al log `totales_turno.log` (una línea JSON con número
+    de secuencia) y cada SNAPSHOT_CADA registros se guarda el estado completo en
+    `totales_turno.json`. Al iniciar se carga el snapshot y se reproducen los
+    registros del log con secuencia posterior.
+    """
+
+    def __init__(self, carpeta: str, zona):
+        self.zona = zona
+        self.ruta_snapshot = os.path.join(carpeta, "totales_turno.json")
+        self.ruta_log = os.path.join(carpeta, "totales_turno.log")
+        self.secuencia = 0
+        self.pendientes = 0
+        # {turno: {"general": acumulado, "material": {valor: acumulado}, ...}}
+        self.turnos = {}
+        if not os.path.exists(carpeta):
+            os.makedirs(carpeta)
+        self._cargar()
+
+    def _cargar(self) -> None:
+        try:
+            if os.path.exists(self.ruta_snapshot):
+                with open(self.ruta_snapshot, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.secuencia = data.get("secuencia", 0)
+                self.turnos = data.get("turnos", {})
+        except Exception as e:
+            print(f"Error al leer snapshot de totales: {e}")
+
+        if not os.path.exists(self.ruta_log):
+            return
+        try:
+            with open(self.ruta_log, "r+b") as f:
+                contenido = f.read()
+                if contenido and not contenido.endswith(b"\n"):
+                    # Última línea incompleta por un cierre inesperado: se descarta para que
+                    # el próximo registro no quede pegado a ella
+                    contenido = contenido[:contenido.rfind(b"\n") + 1]
+                    f.truncate(len(contenido))
+            for linea in contenido.decode("utf-8", errors="replace").splitlines():
+                try:
+                    registro = json.loads(linea)
+                    if registro["seq"] <= self.secuencia:
+                        continue
+                    self._aplicar(registro)
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"Registro de totales inválido omitido: {e}")
+                    continue
+                self.secuencia = registro["seq"]
+                self.pendientes += 1
+        except Exception as e:
+            print(f"Error al leer log de totales: {e}")
+
+    @staticmethod
+    def clave_turno(inicio: datetime) -> str:
+        return inicio.strftime("%Y-%m-%d %H:%M")
+
+    def turno_actual(self) -> str:
+        return self.clave_turno(inicio_turno(datetime.now(self.zona)))
+
+    def _aplicar(self, registro: dict) -> None:
+        turno = self.turnos.get(registro["turno"])
+        if turno is None:
+            turno = {"general": nuevo_acumulado()}
+            for dimension in DIMENSIONES:
+                turno[dimension] = {}
+            self.turnos[registro["turno"]] = turno
+        acumular(turno["general"], registro["peso"])
+        for dimension in DIMENSIONES:
+            valores = turno[dimension]
+            valor = registro[dimension]
+            if valor not in valores:
+                valores[valor] = nuevo_acumulado()
+            acumular(valores[valor], registro["peso"])
+
+    def registrar(self, material: str, operador: str, destino: str,
+                  peso: float, ahora: datetime | None = None) -> None:
+        """Registra una etiqueta impresa en los totales de su turno."""
+        if ahora is None:
+            ahora = datetime.now(self.zona)
+        turno = self.clave_turno(inicio_turno(ahora))
+        nuevo_turno = turno not in self.turnos
+
+        self.secuencia += 1
+        registro = {
+            "seq": self.secuencia,
+            "turno": turno,
+            "fecha": ahora.isoformat(),
+            "material": material,
+            "operador": operador,
+            "destino": destino,
+            "peso": peso,
+        }
+        self._aplicar(registro)
+        try:
+            with open(self.ruta_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"Error al escribir log de totales: {e}")
+
+        self.pendientes += 1
+        if nuevo_turno or self.pendientes >= SNAPSHOT_CADA:
+            self.guardar_snapshot()
+
+    def guardar_snapshot(self) -> None:
+        """Guarda el estado completo y vacía el log de registros."""
+        for turno in sorted(self.turnos)[:-TURNOS_CONSERVADOS]:
+            del self.turnos[turno]
+        data = {"secuencia": self.secuencia, "turnos": self.turnos}
+        temporal = self.ruta_snapshot + ".tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta_snapshot)
+            # Si se cierra antes de vaciar el log, los registros ya incluidos se omiten por secuencia
+            open(self.ruta_log, "w", encoding="utf-8").close()
+            self.pendientes = 0
+        except Exception as e:
+            print(f"Error al guardar snapshot de totales: {e}")
+
+
+def mostrar_ventana_totales(parent: tk.Tk, totales: TotalesTurno) -> None:
+    """
+    Muestra una ventana con el resumen de totales del turno seleccionado,
+    agrupado por material, operador y destino.
+    """
+    ventana = tk.Toplevel(parent)
+    ventana.title("Totales por Turno")
+    ventana.geometry("700x500")
+
+    frame_turno = tk.Frame(ventana)
+    frame_turno.pack(fill="x", padx=10, pady=10)
+    tk.Label(frame_turno, text="Turno:", font=("Lato", 12)).pack(side="left")
+    combo_turno = ttk.Combobox(frame_turno, state="readonly", font=("Lato", 10), width=20)
+    combo_turno.pack(side="left", padx=5)
+    lbl_general = tk.Label(ventana, text="", font=("Lato", 12))
+    lbl_general.pack(fill="x", padx=10)
+
+    notebook = ttk.Notebook(ventana)
+    notebook.pack(fill="both", expand=True, padx=10, pady=10)
+    columnas = ("cantidad", "total", "minimo", "maximo", "promedio")
+    tablas = {}
+    for dimension in DIMENSIONES:
+        tabla = ttk.Treeview(notebook, columns=columnas)
+        tabla.heading("#0", text=dimension.capitalize())
+        for columna in columnas:
+            tabla.heading(columna, text=columna.capitalize())
+            tabla.column(columna, width=90, anchor="e")
+        notebook.add(tabla, text=dimension.capitalize())
+        tablas[dimension] = tabla
+
+    def mostrar_turno(*args):
+        turno = totales.turnos.get(combo_turno.get())
+        for tabla in tablas.values():
+            tabla.delete(*tabla.get_children())
+        if turno is None:
+            lbl_general.config(text="Sin etiquetas registradas en este turno.")
+            return
+        general = turno["general"]
+        lbl_general.config(text=f"Etiquetas: {general['cantidad']}   Total: {general['total']:.3f} kg   "
+                                f"Promedio: {promedio(general):.3f} kg")
+        for dimension, tabla in tablas.items():
+            for valor, acumulado in sorted(turno[dimension].items()):
+                tabla.insert("", "end", text=valor or "(vacío)", values=(
+                    acumulado["cantidad"],
+                    f"{acumulado['total']:.3f}",
+                    f"{acumulado['minimo']:.3f}",
+                    f"{acumulado['maximo']:.3f}",
+                    f"{promedio(acumulado):.3f}",
+                ))
+
+    def actualizar():
+        actual = totales.turno_actual()
+        turnos = sorted(set(totales.turnos) | {actual}, reverse=True)
+        seleccionado = combo_turno.get() or actual
+        combo_turno.config(values=turnos)
+        combo_turno.set(seleccionado)
+        mostrar_turno()
+
+    combo_turno.bind("<<ComboboxSelected>>", mostrar_turno)
+    btn_actualizar = tk.Button(frame_turno, text="Actualizar", font=("Lato", 10), command=actualizar)
+    btn_actualizar.pack(side="right")
+
+    actualizar()
@@ -0,0 +1,118 @@
+import tkinter as tk
+
+# Espera después de la última tecla antes de redibujar
+DEBOUNCE_MS = 150
+# Cada cuánto se revisa si cambió el tamaño de etiqueta configurado
+REVISION_TAMANO_MS = 2000
+
+
+def interpretar_zpl(zpl: str) -> list[tuple[int, int, str, int, bool]]:
+    """
+    Interpreta el subconjunto de ZPL que emite generar_zpl (^FO, ^CF, ^FWR, ^FD, ^FS)
+    y devuelve los campos como (x, y, texto, alto_fuente, rotado).
+    """
+    campos = []
+    x = y = 0
+    alto_fuente = 30
+    rotado = False
+    texto = None
+    for comando in zpl.split("^")[1:]:
+        codigo = comando[:2].upper()
+        argumentos = comando[2:].strip()
+        if codigo == "FO":
+            partes = argumentos.split(",")
+            x = int(partes[0] or 0)
+            y = int(partes[1] or 0) if len(partes) > 1 else 0
+        elif codigo == "CF":
+            partes = argumentos.split(",")
+            if len(partes) > 1 and partes[1]:
+                alto_fuente = int(partes[1])
+        elif codigo == "FW":
+            rotado = argumentos[:1].upper() == "R"
+        elif codigo == "FD":
+            # En ^FD el contenido no se recorta: llega hasta el siguiente comando
+            texto = comando[2:]
+        elif codigo == "FS":
+            if texto is not None:
+                campos.append((x, y, texto, alto_fuente, rotado))
+            texto = None
+    return campos
+
+
+class VistaPreviaEtiqueta:
+    """
+    Vista previa a escala de la etiqueta, dibujada a partir del ZPL real.
+
+    `generar` es una función sin argumentos que devuelve (zpl, ancho_dots, alto_dots).
+    Las actualizaciones se agrupan con un debounce y sólo se modifican en el Canvas
+    los campos que cambiaron respecto al dibujo anterior.
+    """
+
+    def __init__(self, parent: tk.Widget, generar, ancho: int = 300, alto: int = 220):
+        self.generar = generar
+        self.ancho = ancho
+        self.alto = alto
+        self.margen = 6
+        self.canvas = tk.Canvas(parent, width=ancho, height=alto, bg="#eeeeee", highlightthickness=0)
+        self.fondo = self.canvas.create_rectangle(0, 0, 0, 0, fill="white", outline="#999999")
+        # Por cada campo: (id del item en el Canvas, estado dibujado)
+        self.items = []
+        self.dimensiones = None
+        self.pendiente = None
+
+    def programar(self, *args) -> None:
+        """Programa un redibujo; si ya había uno pendiente lo reemplaza (debounce)."""
+        if self.pendiente is not None:
+            self.canvas.after_cancel(self.pendiente)
+        self.pendiente = self.canvas.after(DEBOUNCE_MS, self.actualizar)
+
+    def vigilar_tamano(self, obtener_dimensiones) -> None:
+        """
+        Revisa periódicamente `obtener_dimensiones()` (ancho, alto en dots) y
+        programa un redibujo sólo si el tamaño de etiqueta cambió, p. ej. al
+        sincronizarse la configuración desde otra estación.
+        """
+        if self.dimensiones is not None and tuple(obtener_dimensiones()) != self.dimensiones:
+            self.programar()
+        self.canvas.after(REVISION_TAMANO_MS, self.vigilar_tamano, obtener_dimensiones)
+
+    def actualizar(self) -> None:
+        self.pendiente = None
+        zpl, ancho_dots, alto_dots = self.generar()
+        escala = min((self.ancho - 2 * self.margen) / ancho_dots,
+                     (self.alto - 2 * self.margen) / alto_dots)
+        x0 = (self.ancho - ancho_dots * escala) / 2
+        y0 = (self.alto - alto_dots * escala) / 2
+
+        if self.dimensiones != (ancho_dots, alto_dots):
+            # Cambió el tamaño de etiqueta: se redibujan todos los campos
+            self.dimensiones = (ancho_dots, alto_dots)
+            self.canvas.coords(self.fondo, x0, y0, x0 + ancho_dots * escala, y0 + alto_dots * escala)
+            for item, _ in self.items:
+                self.canvas.delete(item)
+            self.items = []
+
+        campos = interpretar_zpl(zpl)
+        for indice, campo in enumerate(campos):
+            x, y, texto, alto_fuente, rotado = campo
+            px = x0 + x * escala
+            py = y0 + y * escala
+            fuente = ("Arial", -max(1, round(alto_fuente * escala)))
+            # ^FO es la esquina superior izquierda del campo; rotado 90° horario esa
+            # esquina corresponde a la inferior izquierda del texto sin rotar.
+            anchor = "sw" if rotado else "nw"
+            angulo = 270 if rotado else 0
+            if indice < len(self.items):
+                item, anterior = self.items[indice]
+                if anterior == campo:
+                    continue
+                self.canvas.coords(item, px, py)
+                self.canvas.itemconfigure(item, text=texto, font=fuente, anchor=anchor, angle=angulo)
+                self.items[indice] = (item, campo)
+            else:
+                item = self.canvas.create_text(px, py, text=texto, font=fuente, anchor=anchor, angle=angulo)
+                self.items.append((item, campo))
+
+        for item, _ in self.items[len(campos):]:
+            self.canvas.delete(item)
+        del self.items[len(campos):]
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import json
 import os
+from configuracion.sincronizacion import publicar_en_segundo_plano
 
 def obtener_config_etiqueta_mm() -> tuple[float, float]:
     """
@@ -46,16 +47,18 @@ def guardar_config_etiqueta_mm(ancho: float, alto: float) -> bool:
     try:
         with open(config_file, "w", encoding="utf-8") as f:
             json.dump(config, f, indent=4)
+        publicar_en_segundo_plano("config_etiqueta")
         return True
     except Exception as e:
         print(f"Error al guardar configuración de etiqueta: {e}")
         return False
 
-def mostrar_ventana_config_etiqueta(parent: tk.Tk) -> None:
+def mostrar_ventana_config_etiqueta(parent: tk.Tk, al_guardar=None) -> None:
     """
     Crea y muestra la ventana de configuración de tamaño de etiqueta.
     La ventana permite elegir un tamaño predefinido de una lista ordenada o
     ingresar un valor personalizado que se guardará en el JSON.
+    Si se indica `al_guardar`, se llama después de guardar un nuevo tamaño.
     """
     ventana = tk.Toplevel(parent)
     ventana.title("Configuración de Tamaño de Etiqueta")
@@ -154,6 +157,8 @@ def mostrar_ventana_config_etiqueta(parent: tk.Tk) -> None:
             messagebox.showinfo("Éxito", f"Nuevo tamaño de etiqueta configurado: {nuevo_ancho} x {nuevo_alto} mm", parent=ventana)
            
             lbl_actual.config(text=f"Configuración actual: {nuevo_ancho} x {nuevo_alto} mm")
+            if al_guardar is not None:
+                al_guardar()
         else:
             messagebox.showerror("Error", "No se pudo guardar la nueva configuración.",parent=ventana)
             
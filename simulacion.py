@@ -0,0 +1,286 @@
+"""
+Arnés de simulación para certificar versiones sin báscula ni impresora.
+
+Ejecuta el camino real peso -> ZPL -> impresión (`procesar_impresion`) sin
+interfaz gráfica, usando una báscula simulada (cargas que se colocan, se
+asientan y se retiran, con ruido) y una impresora falsa que registra los bytes
+recibidos y puede inyectar latencia y errores.
+
+Ejemplo (1 hora a 10,000 etiquetas/hora):
+    python simulacion.py --horas 1 --tasa 10000
+Ejemplo acelerado (sin esperar entre etiquetas):
+    python simulacion.py --etiquetas 50000 --acelerado
+"""
+import argparse
+import contextlib
+import io
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import types
+
+# Frecuencia de muestreo de la báscula simulada
+FRECUENCIA_BASCULA_HZ = 20
+# El ruido gaussiano se recorta a ± este número de desviaciones estándar
+RUIDO_MAX_SIGMAS = 3
+
+
+class BasculaSimulada:
+    """
+    Flujo de lecturas de una báscula: vacía -> colocando -> asentando -> estable -> retirando.
+    El asentamiento es una oscilación amortiguada y todas las lecturas llevan ruido
+    gaussiano recortado a ±RUIDO_MAX_SIGMAS desviaciones (ver ruido_max_kg).
+    Si se indica `al_leer(t, kg)`, recibe cada lectura con su tiempo simulado en segundos.
+    """
+
+    def __init__(self, semilla: int | None = None, ruido_kg: float = 0.005,
+                 peso_min: float = 100.0, peso_max: float = 999.0, al_leer=None):
+        self.rng = random.Random(semilla)
+        self.ruido_kg = ruido_kg
+        self.peso_min = peso_min
+        self.peso_max = peso_max
+        self.al_leer = al_leer
+        self.muestras = 0
+        self.ruido_max_kg = RUIDO_MAX_SIGMAS * ruido_kg
+
+    def _leer(self, valor: float) -> float:
+        self.muestras += 1
+        ruido = max(-self.ruido_max_kg, min(self.ruido_max_kg, self.rng.gauss(0, self.ruido_kg)))
+        lectura = max(0.0, valor + ruido)
+        if self.al_leer is not None:
+            self.al_leer(self.muestras / FRECUENCIA_BASCULA_HZ, lectura)
+        return lectura
+
+    def ciclo_carga(self):
+        """Genera las lecturas (estado, kg) de una carga completa."""
+        peso = round(self.rng.uniform(self.peso_min, self.peso_max), 3)
+        self.peso_estable = peso
+        for _ in range(self.rng.randint(2, 10)):
+            yield "vacia", self._leer(0.0)
+        pasos = self.rng.randint(3, 8)
+        for i in range(1, pasos + 1):
+            yield "colocando", self._leer(peso * i / pasos)
+        sobrepaso = peso * self.rng.uniform(0.02, 0.08)
+        for i in range(self.rng.randint(10, 30)):
+            yield "asentando", self._leer(peso + sobrepaso * math.exp(-i / 4) * math.cos(i))
+        for _ in range(self.rng.randint(5, 20)):
+            yield "estable", self._leer(peso)
+        for i in range(self.rng.randint(3, 8), 0, -1):
+            yield "retirando", self._leer(peso * i / 8)
+
+    def siguiente_peso_estable(self) -> str:
+        """
+        Recorre un ciclo de carga completo y devuelve la última lectura estable
+        (con ruido) con formato 000.000, como la tomaría el operador antes de retirar la carga.
+        """
+        ultima_estable = None
+        for estado, lectura in self.ciclo_carga():
+            if estado == "estable":
+                ultima_estable = lectura
+        return f"{ultima_estable:07.3f}"
+
+
+class ImpresoraSimulada:
+    """
+    Sustituto del módulo win32print que registra los trabajos recibidos.
+    Puede inyectar latencia (segundos) y errores (probabilidad por trabajo).
+    """
+
+    def __init__(self, latencia_s: float = 0.0, prob_error: float = 0.0,
+                 semilla: int | None = None):
+        self.latencia_s = latencia_s
+        self.prob_error = prob_error
+        self.rng = random.Random(semilla)
+        self.trabajos = []
+        self.errores = 0
+        self._buffer = None
+
+    def como_modulo(self) -> types.ModuleType:
+        modulo = types.ModuleType("win32print")
+        for nombre in ("GetDefaultPrinter", "OpenPrinter", "StartDocPrinter", "StartPagePrinter",
+                       "WritePrinter", "EndPagePrinter", "EndDocPrinter", "ClosePrinter"):
+            setattr(modulo, nombre, getattr(self, nombre))
+        return modulo
+
+    def GetDefaultPrinter(self):
+        return "Impresora Simulada"
+
+    def OpenPrinter(self, nombre):
+        return nombre
+
+    def StartDocPrinter(self, hprinter, nivel, info):
+        self._buffer = bytearray()
+        return len(self.trabajos) + 1
+
+    def StartPagePrinter(self, hprinter):
+        pass
+
+    def WritePrinter(self, hprinter, datos: bytes):
+        if self.latencia_s:
+            time.sleep(self.latencia_s)
+        if self.prob_error and self.rng.random() < self.prob_error:
+            self.errores += 1
+            self._buffer = None
+            raise RuntimeError("Error simulado de impresora")
+        self._buffer.extend(datos)
+        return len(datos)
+
+    def EndPagePrinter(self, hprinter):
+        pass
+
+    def EndDocPrinter(self, hprinter):
+        self.trabajos.append(bytes(self._buffer))
+        self._buffer = None
+
+    def ClosePrinter(self, hprinter):
+        pass
+
+
+def percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def memoria_proceso() -> int:
+    """Memoria residente (RSS) del proceso en bytes."""
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        contadores = PROCESS_MEMORY_COUNTERS()
+        contadores.cb = ctypes.sizeof(contadores)
+        proceso = ctypes.windll.kernel32.GetCurrentProcess()
+        ctypes.windll.psapi.GetProcessMemoryInfo(proceso, ctypes.byref(contadores), contadores.cb)
+        return contadores.WorkingSetSize
+    with open("/proc/self/statm", "r") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def ejecutar(etiquetas: int, tasa_por_hora: float, acelerado: bool,
+             latencia_s: float, prob_error: float, semilla: int | None) -> bool:
+    """Corre la simulación, imprime el reporte y devuelve True si se certifica."""
+    # Datos de la aplicación en una carpeta temporal para no tocar los de la estación
+    os.environ["APPDATA"] = tempfile.mkdtemp(prefix="bascula_sim_")
+    impresora = ImpresoraSimulada(latencia_s, prob_error, semilla)
+    sys.modules["win32print"] = impresora.como_modulo()
+    import bascula
+    from configuracion.grafica_peso import BufferPeso, VENTANAS_TIEMPO
+
+    # Todas las lecturas alimentan el mismo buffer de la gráfica de tendencia
+    tendencia = BufferPeso(680, max(VENTANAS_TIEMPO.values()))
+    bascula_sim = BasculaSimulada(semilla, al_leer=tendencia.agregar)
+    errores_mostrados = []
+    bascula.messagebox = types.SimpleNamespace(
+        showerror=lambda titulo, mensaje, **kw: errores_mostrados.append(mensaje))
+    pesos_enviados = {}
+    # La báscula se simula antes de medir; procesar_impresion sólo toma la lectura lista
+    lectura_actual = [None]
+    bascula.generar_peso_aleatorio = lambda: lectura_actual[0]
+
+    intervalo = 3600.0 / tasa_por_hora
+    latencias = []
+    memoria = []
+    memoria_inicial = memoria_proceso()
+    inicio = time.perf_counter()
+
+    for n in range(1, etiquetas + 1):
+        objetivo = inicio + (n - 1) * intervalo
+        if not acelerado:
+            espera = objetivo - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+        lectura_actual[0] = bascula_sim.siguiente_peso_estable()
+        # Lectura entregada y peso real de la carga, para validar lo impreso
+        pesos_enviados[n] = (lectura_actual[0], bascula_sim.peso_estable)
+        t0 = time.perf_counter()
+        # generar_zpl e imprimir_etiqueta escriben en consola; se descarta
+        with contextlib.redirect_stdout(io.StringIO()):
+            bascula.procesar_impresion("Carton Nacional", "SIM", f"SIM-{n:08d}", "Almacen", None)
+        latencias.append(time.perf_counter() - t0)
+        if n % 1000 == 0 or n == etiquetas:
+            memoria.append(memoria_proceso())
+
+    duracion = time.perf_counter() - inicio
+
+    # Conciliación de etiquetas recibidas contra las enviadas
+    recibidas = {}
+    pesos_incorrectos = 0
+    for trabajo in impresora.trabajos:
+        texto = trabajo.decode("utf-8")
+        encontrado = re.search(r"SIM-(\d+)", texto)
+        if not encontrado:
+            continue
+        n = int(encontrado.group(1))
+        recibidas[n] = recibidas.get(n, 0) + 1
+        peso = re.search(r"Peso: ([\d.]+) kg", texto)
+        lectura, peso_real = pesos_enviados.get(n, (None, None))
+        # Debe imprimirse la lectura de la báscula y ésta debe ser estable: dentro del
+        # ruido máximo más el redondeo a 3 decimales (y un margen para el error de punto flotante)
+        if (not peso or peso.group(1) != lectura
+                or abs(float(lectura) - peso_real) > bascula_sim.ruido_max_kg + 0.0005 + 1e-9):
+            pesos_incorrectos += 1
+    duplicadas = sum(1 for veces in recibidas.values() if veces > 1)
+    perdidas = etiquetas - len(recibidas) - len(errores_mostrados)
+    totales = sum(t["general"]["cantidad"] for t in bascula.totales_turno.turnos.values())
+
+    print(f"Etiquetas solicitadas: {etiquetas}")
+    print(f"Duración: {duracion:.1f} s ({etiquetas / duracion * 3600:.0f} etiquetas/hora)")
+    print(f"Lecturas de báscula simuladas: {bascula_sim.muestras} "
+          f"({bascula_sim.muestras / FRECUENCIA_BASCULA_HZ / 60:.0f} min a {FRECUENCIA_BASCULA_HZ} Hz), "
+          f"en buffer de tendencia: {tendencia.cantidad}")
+    print("Latencia procesar_impresion (ms): "
+          f"p50={percentil(latencias, 50) * 1000:.2f} "
+          f"p90={percentil(latencias, 90) * 1000:.2f} "
+          f"p99={percentil(latencias, 99) * 1000:.2f} "
+          f"max={max(latencias) * 1000:.2f}")
+    # El crecimiento del RSS incluye lo que este arnés guarda de cada trabajo recibido
+    registrado = sum(len(trabajo) for trabajo in impresora.trabajos)
+    print(f"Memoria (RSS): inicial={memoria_inicial / 1024:.0f} KiB final={memoria[-1] / 1024:.0f} KiB "
+          f"crecimiento={(memoria[-1] - memoria_inicial) / 1024:.0f} KiB "
+          f"(de ello ~{registrado / 1024:.0f} KiB de trabajos registrados por el arnés)")
+    print(f"Recibidas: {len(recibidas)}  Errores inyectados: {impresora.errores}  "
+          f"Errores mostrados: {len(errores_mostrados)}")
+    print(f"Perdidas: {perdidas}  Duplicadas: {duplicadas}  Peso incorrecto: {pesos_incorrectos}")
+    print(f"Registradas en totales del turno: {totales}")
+
+    certificado = (perdidas == 0 and duplicadas == 0 and pesos_incorrectos == 0
+                   and totales == len(recibidas))
+    print("RESULTADO:", "CERTIFICADO" if certificado else "FALLIDO")
+    return certificado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga y resistencia sin hardware.")
+    parser.add_argument("--horas", type=float, default=None,
+                        help="Duración de la prueba en horas (a la tasa indicada)")
+    parser.add_argument("--etiquetas", type=int, default=1000, help="Cantidad de etiquetas")
+    parser.add_argument("--tasa", type=float, default=10000, help="Etiquetas por hora")
+    parser.add_argument("--acelerado", action="store_true", help="No esperar entre etiquetas")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latencia de impresora (s)")
+    parser.add_argument("--prob-error", type=float, default=0.0,
+                        help="Probabilidad de error de impresora por trabajo")
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+
+    etiquetas = int(args.horas * args.tasa) if args.horas else args.etiquetas
+    ok = ejecutar(etiquetas, args.tasa, args.acelerado, args.latencia, args.prob_error, args.semilla)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()